@@ -6,10 +6,25 @@ import os
 import yaml
 from typing import Dict, Any, Optional
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, replace
 
 
-@dataclass
+# Use the libyaml-backed safe loader when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Environment variables consulted by _apply_env_overrides
+_ENV_KEYS = (
+    "ENVIRONMENT",
+    "SERVICE_PORT",
+    "SERVICE_NAME",
+    "SUPABASE_URL",
+    "REDIS_HOST",
+    "REDIS_PASSWORD",
+    "ENABLE_AIC",
+    "LOG_LEVEL",
+)
+
+@dataclass(slots=True)
 class DatabaseConfig:
     """Database configuration"""
     provider: str = "supabase"
@@ -27,7 +42,7 @@ class DatabaseConfig:
         return f"postgresql://postgres@{self.host}:{self.port}/{self.database}"
 
 
-@dataclass
+@dataclass(slots=True)
 class RedisConfig:
     """Redis configuration"""
     host: str = "localhost"
@@ -45,7 +60,7 @@ class RedisConfig:
         return f"redis://{self.host}:{self.port}/{self.db}"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AuthConfig:
     """Authentication configuration"""
     provider: str = "supabase"
@@ -53,7 +68,7 @@ class AuthConfig:
     refresh_token_expiration: int = 168  # hours (7 days)
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceConfig:
     """Service configuration"""
     name: str = "auralink-service"
@@ -63,7 +78,7 @@ class ServiceConfig:
     timeout: int = 30
 
 
-@dataclass
+@dataclass(slots=True)
 class MonitoringConfig:
     """Monitoring configuration"""
     log_level: str = "info"
@@ -74,7 +89,7 @@ class MonitoringConfig:
     jaeger_endpoint: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class AICConfig:
     """AIC Protocol configuration"""
     enabled: bool = False
@@ -83,7 +98,7 @@ class AICConfig:
     min_bandwidth: int = 500  # kbps
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Main configuration class"""
     environment: str = "development"
@@ -115,51 +130,16 @@ def load_config(config_path: Optional[str] = None) -> Config:
     Returns:
         Config instance
     """
-    config_dict: Dict[str, Any] = {}
-    
-    # Load from YAML file if provided
-    if config_path and Path(config_path).exists():
-        with open(config_path, 'r') as f:
-            config_dict = yaml.safe_load(f) or {}
-    
     # Create config with defaults
     config = Config()
     
-    # Apply config file values
-    if config_dict:
-        config.environment = config_dict.get("environment", config.environment)
-        
-        if "service" in config_dict:
-            svc = config_dict["service"]
-            config.service = ServiceConfig(
-                name=svc.get("name", config.service.name),
-                port=svc.get("port", config.service.port),
-                host=svc.get("host", config.service.host),
-            )
-        
-        if "database" in config_dict:
-            db = config_dict["database"]
-            config.database = DatabaseConfig(
-                provider=db.get("provider", config.database.provider),
-                host=db.get("host", config.database.host),
-                port=db.get("port", config.database.port),
-                database=db.get("database", config.database.database),
-            )
-        
-        if "redis" in config_dict:
-            rd = config_dict["redis"]
-            config.redis = RedisConfig(
-                host=rd.get("host", config.redis.host),
-                port=rd.get("port", config.redis.port),
-                db=rd.get("db", config.redis.db),
-            )
-        
-        if "aic" in config_dict:
-            aic = config_dict["aic"]
-            config.aic = AICConfig(
-                enabled=aic.get("enabled", config.aic.enabled),
-                compression_ratio=aic.get("compression_ratio", config.aic.compression_ratio),
-            )
+    # Apply config file values if a file was provided
+    if config_path and Path(config_path).exists():
+        # Binary mode lets the parser decode UTF-8 itself
+        with open(config_path, 'rb') as f:
+            config_dict: Dict[str, Any] = yaml.load(f, Loader=_YamlLoader) or {}
+        if config_dict:
+            _apply_yaml(config, config_dict)
     
     # Override with environment variables
     _apply_env_overrides(config)
@@ -167,25 +147,61 @@ def load_config(config_path: Optional[str] = None) -> Config:
     return config
 
 
+# Field names accepted from each YAML section; unknown keys are ignored
+_SERVICE_FIELDS = frozenset(f.name for f in fields(ServiceConfig))
+_DATABASE_FIELDS = frozenset(f.name for f in fields(DatabaseConfig))
+_REDIS_FIELDS = frozenset(f.name for f in fields(RedisConfig))
+_AIC_FIELDS = frozenset(f.name for f in fields(AICConfig))
+
+
+def _apply_yaml(config: Config, config_dict: Dict[str, Any]) -> None:
+    """Apply values loaded from a YAML config file"""
+    config.environment = config_dict.get("environment", config.environment)
+    
+    if svc := config_dict.get("service"):
+        config.service = replace(
+            config.service, **{k: v for k, v in svc.items() if k in _SERVICE_FIELDS}
+        )
+    
+    if db := config_dict.get("database"):
+        config.database = replace(
+            config.database, **{k: v for k, v in db.items() if k in _DATABASE_FIELDS}
+        )
+    
+    if rd := config_dict.get("redis"):
+        config.redis = replace(
+            config.redis, **{k: v for k, v in rd.items() if k in _REDIS_FIELDS}
+        )
+    
+    if aic := config_dict.get("aic"):
+        config.aic = replace(
+            config.aic, **{k: v for k, v in aic.items() if k in _AIC_FIELDS}
+        )
+
+
 def _apply_env_overrides(config: Config) -> None:
     """Apply environment variable overrides"""
+    # Read every override in a single pass; unset keys never leave os.environ
+    env = {k: os.environ[k] for k in _ENV_KEYS if k in os.environ}
+    if not env:
+        return
     
     # Environment
-    if env := os.getenv("ENVIRONMENT"):
-        config.environment = env
+    if value := env.get("ENVIRONMENT"):
+        config.environment = value
     
     # Service
-    if port := os.getenv("SERVICE_PORT"):
+    if port := env.get("SERVICE_PORT"):
         config.service.port = int(port)
-    if name := os.getenv("SERVICE_NAME"):
+    if name := env.get("SERVICE_NAME"):
         config.service.name = name
     
     # Database
-    if host := os.getenv("SUPABASE_URL"):
+    if host := env.get("SUPABASE_URL"):
         config.database.host = host
     
     # Redis
-    if host := os.getenv("REDIS_HOST"):
+    if host := env.get("REDIS_HOST"):
         # Parse host:port format
         if ":" in host:
             parts = host.split(":")
@@ -193,13 +209,13 @@ def _apply_env_overrides(config: Config) -> None:
             config.redis.port = int(parts[1])
         else:
             config.redis.host = host
-    if password := os.getenv("REDIS_PASSWORD"):
+    if password := env.get("REDIS_PASSWORD"):
         config.redis.password = password
     
     # AIC
-    if enable_aic := os.getenv("ENABLE_AIC"):
+    if enable_aic := env.get("ENABLE_AIC"):
         config.aic.enabled = enable_aic.lower() == "true"
     
     # Monitoring
-    if log_level := os.getenv("LOG_LEVEL"):
+    if log_level := env.get("LOG_LEVEL"):
         config.monitoring.log_level = log_level
@@ -3,8 +3,10 @@ Error handling utilities for AuraLink Python services
 """
 
 from enum import Enum
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, Final, Optional
+from datetime import datetime, timezone
+import sys
+import time
 import traceback
 
 
@@ -42,9 +44,42 @@ class ErrorCode(str, Enum):
     REDIS_ERROR = "REDIS_ERROR"
 
 
+# HTTP status codes for error codes; anything not listed maps to 500
+_STATUS_CODE_MAP: Final[Dict[ErrorCode, int]] = {
+    ErrorCode.UNAUTHORIZED: 401,
+    ErrorCode.FORBIDDEN: 403,
+    ErrorCode.INVALID_TOKEN: 401,
+    ErrorCode.EXPIRED_TOKEN: 401,
+    ErrorCode.NOT_FOUND: 404,
+    ErrorCode.VALIDATION_ERROR: 400,
+    ErrorCode.INVALID_INPUT: 400,
+    ErrorCode.MISSING_FIELD: 400,
+    ErrorCode.ALREADY_EXISTS: 409,
+    ErrorCode.CONFLICT: 409,
+    ErrorCode.DUPLICATE_KEY: 409,
+    ErrorCode.SERVICE_UNAVAILABLE: 503,
+    ErrorCode.TIMEOUT: 504,
+    ErrorCode.RATE_LIMITED: 429,
+}
+
+
 class AuraError(Exception):
     """Standardized error class for AuraLink services"""
     
+    __slots__ = (
+        "code",
+        "_code_str",
+        "message",
+        "details",
+        "status_code",
+        "trace_id",
+        "service",
+        "_ts_ns",
+        "_timestamp",
+        "_exc",
+        "_stack",
+    )
+    
     def __init__(
         self,
         code: ErrorCode,
@@ -57,39 +92,44 @@ class AuraError(Exception):
     ):
         super().__init__(message)
         self.code = code
+        self._code_str: str = code.value
         self.message = message
         self.details = details or {}
         self.status_code = status_code or self._get_status_code(code)
-        self.timestamp = datetime.utcnow()
         self.trace_id = trace_id
         self.service = service
-        self.stack = traceback.format_exc() if include_stack else None
+        # Timestamp and stack are materialized on first access; errors that
+        # are raised and swallowed (e.g. by retries) never pay for them
+        self._ts_ns = time.time_ns()
+        self._timestamp: Optional[datetime] = None
+        # Outside an except block there is no traceback worth recording
+        self._exc = sys.exception() if include_stack else None
+        self._stack: Optional[str] = None
+    
+    @property
+    def timestamp(self) -> datetime:
+        """UTC time at which the error was created"""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._ts_ns / 1e9, tz=timezone.utc)
+        return self._timestamp
+    
+    @property
+    def stack(self) -> Optional[str]:
+        """Formatted traceback captured when include_stack was set"""
+        if self._stack is None and self._exc is not None:
+            self._stack = "".join(traceback.format_exception(self._exc))
+            self._exc = None
+        return self._stack
     
     @staticmethod
     def _get_status_code(code: ErrorCode) -> int:
         """Map error codes to HTTP status codes"""
-        mapping = {
-            ErrorCode.UNAUTHORIZED: 401,
-            ErrorCode.FORBIDDEN: 403,
-            ErrorCode.INVALID_TOKEN: 401,
-            ErrorCode.EXPIRED_TOKEN: 401,
-            ErrorCode.NOT_FOUND: 404,
-            ErrorCode.VALIDATION_ERROR: 400,
-            ErrorCode.INVALID_INPUT: 400,
-            ErrorCode.MISSING_FIELD: 400,
-            ErrorCode.ALREADY_EXISTS: 409,
-            ErrorCode.CONFLICT: 409,
-            ErrorCode.DUPLICATE_KEY: 409,
-            ErrorCode.SERVICE_UNAVAILABLE: 503,
-            ErrorCode.TIMEOUT: 504,
-            ErrorCode.RATE_LIMITED: 429,
-        }
-        return mapping.get(code, 500)
+        return _STATUS_CODE_MAP.get(code, 500)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert error to dictionary"""
         result = {
-            "code": self.code.value,
+            "code": self._code_str,
             "message": self.message,
             "timestamp": self.timestamp.isoformat(),
         }
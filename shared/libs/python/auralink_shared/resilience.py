@@ -4,15 +4,22 @@ Includes circuit breaker and retry/backoff utilities
 """
 
 import asyncio
+import threading
 import time
 import random
+from contextlib import nullcontext
 from enum import Enum
-from typing import Callable, Optional, Any, TypeVar, List
-from dataclasses import dataclass
+from typing import Callable, Final, Optional, Any, TypeVar, List, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
 T = TypeVar('T')
 
+_rand = random.random
+
+# Upper bound on precomputed ExponentialBackoff intervals
+_MAX_BACKOFF_STEPS = 64
+
 
 class CircuitState(Enum):
     """Circuit breaker states"""
@@ -31,7 +38,7 @@ class MaxRetriesExceededError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class CircuitBreakerConfig:
     """Circuit breaker configuration"""
     name: str
@@ -41,7 +48,7 @@ class CircuitBreakerConfig:
     interval_seconds: float = 60.0
 
 
-@dataclass
+@dataclass(slots=True)
 class CircuitBreakerStats:
     """Circuit breaker statistics"""
     name: str
@@ -56,79 +63,104 @@ class CircuitBreakerStats:
 class CircuitBreaker:
     """Circuit breaker implementation for Python services"""
     
-    def __init__(self, config: CircuitBreakerConfig):
+    __slots__ = (
+        "name",
+        "max_failures",
+        "timeout_seconds",
+        "max_requests",
+        "interval_seconds",
+        "state",
+        "failures",
+        "successes",
+        "requests",
+        "_last_failure_ns",
+        "_last_state_change_mono",
+        "_lock",
+    )
+    
+    def __init__(self, config: CircuitBreakerConfig, thread_safe: bool = False):
         self.name = config.name
         self.max_failures = config.max_failures
-        self.timeout = timedelta(seconds=config.timeout_seconds)
+        self.timeout_seconds = config.timeout_seconds
         self.max_requests = config.max_requests
-        self.interval = timedelta(seconds=config.interval_seconds)
+        self.interval_seconds = config.interval_seconds
         
         self.state = CircuitState.CLOSED
         self.failures = 0
         self.successes = 0
         self.requests = 0
-        self.last_failure_time: Optional[datetime] = None
-        self.last_state_change = datetime.now()
+        self._last_failure_ns: Optional[int] = None
+        # Internal timing uses the monotonic clock; wall-clock datetimes are
+        # only derived for the externally visible stats fields
+        self._last_state_change_mono = time.monotonic()
         
-        self._lock = asyncio.Lock()
+        # State transitions never await, so a breaker used from a single event
+        # loop needs no lock. Only breakers shared across threads pay for one.
+        self._lock = threading.Lock() if thread_safe else nullcontext()
     
     async def execute(self, func: Callable[..., T], *args, **kwargs) -> T:
         """Execute a function with circuit breaker protection"""
-        await self._before_request()
+        # Probed before admission so nothing can fail between taking a
+        # half-open slot and recording the outcome
+        is_coro = asyncio.iscoroutinefunction(func)
+        
+        if not self._before_request():
+            if self.state == CircuitState.HALF_OPEN:
+                raise CircuitBreakerError("Too many requests in half-open state")
+            raise CircuitBreakerError(f"Circuit breaker '{self.name}' is open")
         
         try:
-            result = await func(*args, **kwargs) if asyncio.iscoroutinefunction(func) else func(*args, **kwargs)
-            await self._on_success()
+            result = await func(*args, **kwargs) if is_coro else func(*args, **kwargs)
+            self._on_success()
             return result
         except Exception as e:
-            await self._on_failure()
+            self._on_failure()
             raise e
     
-    async def _before_request(self):
+    def _before_request(self) -> bool:
         """Check if request can proceed"""
-        async with self._lock:
-            now = datetime.now()
+        with self._lock:
+            now = time.monotonic()
             
             if self.state == CircuitState.OPEN:
                 # Check if timeout has passed
-                if now - self.last_state_change > self.timeout:
-                    self._set_state(CircuitState.HALF_OPEN, now)
-                    self.requests = 0
-                    self.successes = 0
-                    self.failures = 0
-                else:
-                    raise CircuitBreakerError(f"Circuit breaker '{self.name}' is open")
+                if now - self._last_state_change_mono <= self.timeout_seconds:
+                    return False
+                self._set_state(CircuitState.HALF_OPEN, now)
+                self.requests = 0
+                self.successes = 0
+                self.failures = 0
             
             elif self.state == CircuitState.HALF_OPEN:
                 if self.requests >= self.max_requests:
-                    raise CircuitBreakerError(f"Too many requests in half-open state")
+                    return False
                 self.requests += 1
             
             elif self.state == CircuitState.CLOSED:
                 # Reset failures if interval has passed
-                if now - self.last_state_change > self.interval:
+                if now - self._last_state_change_mono > self.interval_seconds:
                     self.failures = 0
-                    self.last_state_change = now
+                    self._last_state_change_mono = now
+            
+            return True
     
-    async def _on_success(self):
+    def _on_success(self):
         """Handle successful request"""
-        async with self._lock:
-            now = datetime.now()
-            
+        with self._lock:
             if self.state == CircuitState.HALF_OPEN:
                 self.successes += 1
                 if self.successes >= self.max_requests:
-                    self._set_state(CircuitState.CLOSED, now)
+                    self._set_state(CircuitState.CLOSED, time.monotonic())
                     self.failures = 0
                     self.successes = 0
                     self.requests = 0
     
-    async def _on_failure(self):
+    def _on_failure(self):
         """Handle failed request"""
-        async with self._lock:
-            now = datetime.now()
+        with self._lock:
+            now = time.monotonic()
             self.failures += 1
-            self.last_failure_time = now
+            self._last_failure_ns = time.time_ns()
             
             if self.state == CircuitState.HALF_OPEN:
                 # Any failure in half-open reopens the circuit
@@ -140,10 +172,23 @@ class CircuitBreaker:
                 if self.failures >= self.max_failures:
                     self._set_state(CircuitState.OPEN, now)
     
-    def _set_state(self, state: CircuitState, now: datetime):
+    def _set_state(self, state: CircuitState, now: float):
         """Change circuit breaker state"""
         self.state = state
-        self.last_state_change = now
+        self._last_state_change_mono = now
+    
+    @property
+    def last_failure_time(self) -> Optional[datetime]:
+        """Wall-clock time of the last failure"""
+        if self._last_failure_ns is None:
+            return None
+        return datetime.fromtimestamp(self._last_failure_ns / 1e9)
+    
+    @property
+    def last_state_change(self) -> datetime:
+        """Wall-clock time of the last state change"""
+        elapsed = time.monotonic() - self._last_state_change_mono
+        return datetime.now() - timedelta(seconds=elapsed)
     
     def get_state(self) -> CircuitState:
         """Get current state"""
@@ -162,7 +207,7 @@ class CircuitBreaker:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RetryConfig:
     """Retry configuration"""
     max_attempts: int = 3
@@ -171,6 +216,21 @@ class RetryConfig:
     multiplier: float = 2.0
     randomization_factor: float = 0.1
     retryable_exceptions: Optional[List[type]] = None
+    _retryable_tuple: Optional[Tuple[type, ...]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self):
+        # isinstance() accepts a tuple of types and checks it in C
+        object.__setattr__(
+            self,
+            "_retryable_tuple",
+            tuple(self.retryable_exceptions) if self.retryable_exceptions else None,
+        )
+
+
+# Shared by retry_async/retry_sync calls that do not pass a config
+_DEFAULT_RETRY_CONFIG: Final[RetryConfig] = RetryConfig()
 
 
 async def retry_async(
@@ -195,7 +255,7 @@ async def retry_async(
         MaxRetriesExceededError: When max retries exceeded
     """
     if config is None:
-        config = RetryConfig()
+        config = _DEFAULT_RETRY_CONFIG
     
     last_exception = None
     delay = config.initial_delay_seconds
@@ -207,9 +267,8 @@ async def retry_async(
             last_exception = e
             
             # Check if error is retryable
-            if config.retryable_exceptions:
-                if not any(isinstance(e, exc_type) for exc_type in config.retryable_exceptions):
-                    raise e
+            if config._retryable_tuple and not isinstance(e, config._retryable_tuple):
+                raise e
             
             # Last attempt, don't wait
             if attempt == config.max_attempts:
@@ -253,7 +312,7 @@ def retry_sync(
         MaxRetriesExceededError: When max retries exceeded
     """
     if config is None:
-        config = RetryConfig()
+        config = _DEFAULT_RETRY_CONFIG
     
     last_exception = None
     delay = config.initial_delay_seconds
@@ -265,9 +324,8 @@ def retry_sync(
             last_exception = e
             
             # Check if error is retryable
-            if config.retryable_exceptions:
-                if not any(isinstance(e, exc_type) for exc_type in config.retryable_exceptions):
-                    raise e
+            if config._retryable_tuple and not isinstance(e, config._retryable_tuple):
+                raise e
             
             # Last attempt, don't wait
             if attempt == config.max_attempts:
@@ -296,26 +354,27 @@ def _calculate_backoff(
     randomization_factor: float
 ) -> float:
     """Calculate next backoff delay with jitter"""
-    # Apply multiplier
+    # Apply multiplier and cap at max
     next_delay = current_delay * multiplier
+    next_delay = next_delay if next_delay < max_delay else max_delay
     
-    # Cap at max
-    if next_delay > max_delay:
-        next_delay = max_delay
-    
-    # Apply jitter
-    if randomization_factor > 0:
-        delta = randomization_factor * next_delay
-        min_delay = next_delay - delta
-        max_jitter = next_delay + delta
-        next_delay = min_delay + random.random() * (max_jitter - min_delay)
-    
-    return next_delay
+    # Apply jitter uniformly in [next_delay - delta, next_delay + delta];
+    # a zero randomization factor leaves the delay unchanged
+    return next_delay * (1.0 + randomization_factor * (2.0 * _rand() - 1.0))
 
 
 class ExponentialBackoff:
     """Exponential backoff strategy"""
     
+    __slots__ = (
+        "initial_interval",
+        "max_interval",
+        "multiplier",
+        "randomization_factor",
+        "_schedule",
+        "_step",
+    )
+    
     def __init__(
         self,
         initial_interval: float = 0.5,
@@ -327,35 +386,46 @@ class ExponentialBackoff:
         self.max_interval = max_interval
         self.multiplier = multiplier
         self.randomization_factor = randomization_factor
-        self.current_interval = initial_interval
+        
+        # The un-jittered intervals only depend on the config, so build them
+        # once; the last entry repeats once the schedule is exhausted
+        self._schedule: List[float] = []
+        interval = initial_interval
+        for _ in range(_MAX_BACKOFF_STEPS):
+            interval *= multiplier
+            if interval >= max_interval:
+                self._schedule.append(max_interval)
+                break
+            self._schedule.append(interval)
+        self._step = 0
+    
+    @property
+    def current_interval(self) -> float:
+        """Un-jittered interval returned by the last call"""
+        if self._step == 0:
+            return self.initial_interval
+        return self._schedule[min(self._step, len(self._schedule)) - 1]
     
     def next_backoff(self) -> float:
         """Get next backoff duration"""
-        # Calculate next interval
-        next_interval = self.current_interval * self.multiplier
-        
-        # Cap at max
-        if next_interval > self.max_interval:
-            next_interval = self.max_interval
+        schedule = self._schedule
+        step = self._step
+        base = schedule[step] if step < len(schedule) else schedule[-1]
+        self._step = step + 1
         
         # Apply randomization
-        delta = self.randomization_factor * next_interval
-        min_interval = next_interval - delta
-        max_interval = next_interval + delta
-        
-        random_interval = min_interval + random.random() * (max_interval - min_interval)
-        
-        self.current_interval = next_interval
-        return random_interval
+        return base * (1.0 + self.randomization_factor * (2.0 * _rand() - 1.0))
     
     def reset(self):
         """Reset to initial interval"""
-        self.current_interval = self.initial_interval
+        self._step = 0
 
 
 class ConstantBackoff:
     """Constant backoff strategy"""
     
+    __slots__ = ("interval",)
+    
     def __init__(self, interval: float = 1.0):
         self.interval = interval
     
@@ -371,6 +441,8 @@ class ConstantBackoff:
 class LinearBackoff:
     """Linear backoff strategy"""
     
+    __slots__ = ("initial_interval", "max_interval", "increment", "current_interval")
+    
     def __init__(
         self,
         initial_interval: float = 0.5,
@@ -0,0 +1,34 @@
+"""
+Root pytest configuration for AuraLink tests
+
+Lives next to pytest.ini so the options and markers below are registered
+no matter which path under tests/ is passed on the command line.
+"""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-integration",
+        action="store_true",
+        default=False,
+        help="run tests marked 'integration' that need live AuraLink services",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "integration: needs live AuraLink services (--run-integration)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip live-service tests before any of their fixtures are built"""
+    if config.getoption("--run-integration"):
+        return
+
+    skip_integration = pytest.mark.skip(reason="needs --run-integration")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_integration)
@@ -0,0 +1,48 @@
+"""
+grpclib client for the AIC Compression Protocol integration tests
+
+Hand-written to match the service in aic_compression.proto. The AI Core
+server keeps serving through grpcio (see app/proto/aic_compression_pb2_grpc);
+both speak the same HTTP/2 wire protocol. Keep the method paths and message
+types in step with the proto when it changes.
+"""
+
+import grpclib.client
+
+from app.proto import aic_compression_pb2
+
+
+class AICCompressionServiceStub:
+    """grpclib client for AICCompressionService"""
+
+    def __init__(self, channel: grpclib.client.Channel) -> None:
+        self.CompressFrame = grpclib.client.UnaryUnaryMethod(
+            channel,
+            '/auralink.aic.v1.AICCompressionService/CompressFrame',
+            aic_compression_pb2.CompressFrameRequest,
+            aic_compression_pb2.CompressFrameResponse,
+        )
+        self.CompressStream = grpclib.client.StreamStreamMethod(
+            channel,
+            '/auralink.aic.v1.AICCompressionService/CompressStream',
+            aic_compression_pb2.CompressFrameRequest,
+            aic_compression_pb2.CompressFrameResponse,
+        )
+        self.GetCompressionHints = grpclib.client.UnaryUnaryMethod(
+            channel,
+            '/auralink.aic.v1.AICCompressionService/GetCompressionHints',
+            aic_compression_pb2.CompressionHintRequest,
+            aic_compression_pb2.CompressionHintResponse,
+        )
+        self.AnalyzeNetworkConditions = grpclib.client.UnaryUnaryMethod(
+            channel,
+            '/auralink.aic.v1.AICCompressionService/AnalyzeNetworkConditions',
+            aic_compression_pb2.NetworkAnalysisRequest,
+            aic_compression_pb2.NetworkAnalysisResponse,
+        )
+        self.HealthCheck = grpclib.client.UnaryUnaryMethod(
+            channel,
+            '/auralink.aic.v1.AICCompressionService/HealthCheck',
+            aic_compression_pb2.HealthCheckRequest,
+            aic_compression_pb2.HealthCheckResponse,
+        )
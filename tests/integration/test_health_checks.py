@@ -4,214 +4,291 @@ Tests the comprehensive readiness and liveness probes
 """
 
 import pytest
+import pytest_asyncio
 import httpx
+import aiohttp
+import fastjsonschema
 import asyncio
-from typing import Dict, Any
+import json
+import socket
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; stdlib json parses the same bodies
+    _loads = json.loads
 
+JsonResult = Tuple[int, Dict[str, Any]]
+
+# Probe body schemas, compiled once into generated validator functions
+HEALTH = fastjsonschema.compile({
+    "type": "object",
+    "required": ["status", "service", "timestamp", "version"],
+    "properties": {
+        "status": {"const": "healthy"},
+        "service": {"const": "auralink-ai-core"},
+    },
+})
+
+LIVENESS = fastjsonschema.compile({
+    "type": "object",
+    "required": ["status", "timestamp", "cpu_percent", "memory_percent", "pid"],
+    "properties": {
+        "status": {"const": "alive"},
+        # Check metrics are reasonable
+        "cpu_percent": {"type": "number", "minimum": 0, "maximum": 100},
+        "memory_percent": {"type": "number", "minimum": 0, "maximum": 100},
+        "pid": {"type": "integer", "exclusiveMinimum": 0},
+    },
+})
+
+READINESS = fastjsonschema.compile({
+    "type": "object",
+    "required": ["ready", "checks", "timestamp", "service"],
+    "properties": {
+        "ready": {"type": "boolean"},
+        # Each service has status and ready flag
+        "checks": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "object",
+                "required": ["status", "ready"],
+                "properties": {"ready": {"type": "boolean"}},
+            },
+        },
+    },
+})
+
+
+@pytest.mark.asyncio(loop_scope="session")
 class TestHealthChecks:
     """Test suite for health check endpoints"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def base_url(self) -> str:
         """Base URL for AI Core service"""
         return "http://localhost:8000"
     
-    @pytest.mark.asyncio
-    async def test_basic_health_check(self, base_url: str):
+    @pytest_asyncio.fixture(scope="session", loop_scope="session")
+    async def client(self, base_url: str) -> httpx.AsyncClient:
+        """HTTP client whose connection pool is reused by every test"""
+        async with httpx.AsyncClient(
+            base_url=base_url,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=5.0
+        ) as client:
+            yield client
+    
+    @pytest_asyncio.fixture(scope="session", loop_scope="session")
+    async def aio_session(self, base_url: str) -> aiohttp.ClientSession:
+        """aiohttp session for burst tests that fan out concurrent requests"""
+        connector = aiohttp.TCPConnector(limit=100, limit_per_host=100, keepalive_timeout=60)
+        async with aiohttp.ClientSession(base_url=base_url, connector=connector) as session:
+            yield session
+    
+    @pytest.fixture(scope="session", autouse=True)
+    def _require_service(self, base_url: str):
+        """Skip every health check at once when nothing listens on the service port"""
+        url = httpx.URL(base_url)
+        port = url.port or (443 if url.scheme == "https" else 80)
+        try:
+            socket.create_connection((url.host, port), timeout=0.5).close()
+        except OSError:
+            pytest.skip(f"AI Core not running at {base_url}")
+    
+    @pytest_asyncio.fixture(scope="session", loop_scope="session", autouse=True)
+    async def _wait_ready(self, _require_service, client: httpx.AsyncClient):
+        """Poll readiness until services are initialized instead of sleeping blindly"""
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                response = await client.get("/readiness")
+            except httpx.TransportError:
+                pass  # Service still starting up
+            else:
+                if response.status_code == 200:
+                    return
+                try:
+                    body = _loads(response.content)
+                except ValueError:
+                    return  # Not a readiness payload; nothing to wait for
+                # FastAPI wraps the 503 payload in "detail"
+                checks = body.get("detail", body).get("checks", {})
+                required = [c for c in checks.values() if not c.get("optional")]
+                # An erroring or unconfigured dependency will not recover by
+                # waiting; only keep polling while a service is still starting
+                if any(c.get("status") == "error" for c in required):
+                    return
+                if not any(c.get("status") == "not_initialized" for c in required):
+                    return
+            await asyncio.sleep(0.05)
+    
+    @pytest_asyncio.fixture(scope="session", loop_scope="session")
+    async def get_json(self, client: httpx.AsyncClient) -> Callable[[str], Awaitable[JsonResult]]:
+        """Fetch a path once per session and cache its status code and parsed body"""
+        cache: Dict[str, JsonResult] = {}
+
+        async def _get(path: str) -> JsonResult:
+            if path not in cache:
+                response = await client.get(path)
+                cache[path] = (response.status_code, _loads(response.content))
+            return cache[path]
+
+        return _get
+    
+    @pytest_asyncio.fixture(scope="session", loop_scope="session")
+    async def probe_responses(
+        self, get_json: Callable[[str], Awaitable[JsonResult]]
+    ) -> Dict[str, JsonResult]:
+        """One result per probe endpoint, fetched concurrently and shared by tests"""
+        paths = ("/liveness", "/readiness", "/health", "/health/detailed")
+        results = await asyncio.gather(*[get_json(path) for path in paths])
+        return dict(zip(paths, results))
+    
+    async def test_basic_health_check(self, probe_responses: Dict[str, JsonResult]):
         """Test basic health endpoint always returns 200"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{base_url}/health")
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "healthy"
-            assert data["service"] == "auralink-ai-core"
-            assert "timestamp" in data
-            assert "version" in data
-    
-    @pytest.mark.asyncio
-    async def test_detailed_health_check(self, base_url: str):
+        status_code, data = probe_responses["/health"]
+
+        assert status_code == 200
+        HEALTH(data)
+    
+    async def test_detailed_health_check(self, probe_responses: Dict[str, JsonResult]):
         """Test detailed health endpoint includes system metrics"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{base_url}/health/detailed")
-            
-            assert response.status_code == 200
-            data = response.json()
-            
-            # Check basic fields
-            assert data["status"] == "healthy"
-            assert data["service"] == "auralink-ai-core"
-            
-            # Check system metrics
-            assert "system" in data
-            assert "cpu_percent" in data["system"]
-            assert "memory" in data["system"]
-            assert "disk" in data["system"]
-            assert "process" in data["system"]
-            
-            # Check dependencies
-            assert "dependencies" in data
-            assert "database" in data["dependencies"]
-            assert "redis" in data["dependencies"]
-    
-    @pytest.mark.asyncio
-    async def test_readiness_check_when_ready(self, base_url: str):
+        status_code, data = probe_responses["/health/detailed"]
+
+        assert status_code == 200
+
+        # Check basic fields
+        assert data["status"] == "healthy"
+        assert data["service"] == "auralink-ai-core"
+
+        # Check system metrics
+        assert "system" in data
+        assert "cpu_percent" in data["system"]
+        assert "memory" in data["system"]
+        assert "disk" in data["system"]
+        assert "process" in data["system"]
+
+        # Check dependencies
+        assert "dependencies" in data
+        assert "database" in data["dependencies"]
+        assert "redis" in data["dependencies"]
+    
+    async def test_readiness_check_when_ready(self, probe_responses: Dict[str, JsonResult]):
         """Test readiness probe returns 200 when all services initialized"""
-        async with httpx.AsyncClient() as client:
-            # Wait for services to initialize
-            await asyncio.sleep(2)
-            
-            response = await client.get(f"{base_url}/readiness")
-            
-            # Should be 200 if all services are ready
-            if response.status_code == 200:
-                data = response.json()
-                assert data["ready"] is True
-                assert "checks" in data
-                assert "database" in data["checks"]
-                assert data["checks"]["database"]["ready"] is True
-            # Or 503 if still initializing
-            elif response.status_code == 503:
-                data = response.json()
-                assert data["ready"] is False
-                assert "checks" in data
-    
-    @pytest.mark.asyncio
-    async def test_readiness_check_structure(self, base_url: str):
-        """Test readiness check has correct structure"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{base_url}/readiness")
-            
-            data = response.json()
-            
-            # Check required fields
-            assert "ready" in data
-            assert isinstance(data["ready"], bool)
+        status_code, data = probe_responses["/readiness"]
+
+        # Should be 200 if all services are ready
+        if status_code == 200:
+            assert data["ready"] is True
             assert "checks" in data
-            assert isinstance(data["checks"], dict)
-            assert "timestamp" in data
-            assert "service" in data
-            
-            # Check each service has status and ready flag
-            for service_name, service_data in data["checks"].items():
-                assert "status" in service_data
-                assert "ready" in service_data
-                assert isinstance(service_data["ready"], bool)
-    
-    @pytest.mark.asyncio
-    async def test_liveness_check(self, base_url: str):
+            assert "database" in data["checks"]
+            assert data["checks"]["database"]["ready"] is True
+        # Or 503 if still initializing
+        elif status_code == 503:
+            assert data["ready"] is False
+            assert "checks" in data
+    
+    async def test_readiness_check_structure(self, probe_responses: Dict[str, JsonResult]):
+        """Test readiness check has correct structure"""
+        status_code, data = probe_responses["/readiness"]
+
+        READINESS(data)
+    
+    async def test_liveness_check(self, probe_responses: Dict[str, JsonResult]):
         """Test liveness probe returns 200 when process is alive"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{base_url}/liveness")
-            
-            assert response.status_code == 200
-            data = response.json()
-            
-            assert data["status"] == "alive"
-            assert "timestamp" in data
-            assert "cpu_percent" in data
-            assert "memory_percent" in data
-            assert "pid" in data
-            
-            # Check metrics are reasonable
-            assert 0 <= data["cpu_percent"] <= 100
-            assert 0 <= data["memory_percent"] <= 100
-            assert data["pid"] > 0
-    
-    @pytest.mark.asyncio
-    async def test_liveness_event_loop_responsive(self, base_url: str):
+        status_code, data = probe_responses["/liveness"]
+
+        assert status_code == 200
+        LIVENESS(data)
+    
+    async def test_liveness_event_loop_responsive(self, aio_session: aiohttp.ClientSession):
         """Test liveness check verifies event loop is responsive"""
-        async with httpx.AsyncClient() as client:
-            # Make multiple rapid requests
-            responses = await asyncio.gather(*[
-                client.get(f"{base_url}/liveness")
-                for _ in range(5)
-            ])
-            
-            # All should succeed if event loop is responsive
-            for response in responses:
-                assert response.status_code == 200
-                data = response.json()
-                assert data["status"] == "alive"
-    
-    @pytest.mark.asyncio
-    async def test_readiness_database_check(self, base_url: str):
+        async def get_liveness() -> JsonResult:
+            async with aio_session.get("/liveness") as response:
+                return response.status, await response.json()
+
+        # Make multiple rapid requests
+        results = await asyncio.gather(*[get_liveness() for _ in range(5)])
+
+        # All should succeed if event loop is responsive
+        for status_code, data in results:
+            assert status_code == 200
+            assert data["status"] == "alive"
+    
+    async def test_readiness_database_check(self, probe_responses: Dict[str, JsonResult]):
         """Test readiness check validates database connection"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{base_url}/readiness")
-            data = response.json()
-            
-            # Database should always be checked
-            assert "database" in data["checks"]
-            db_check = data["checks"]["database"]
-            
-            # Should have status and ready fields
-            assert "status" in db_check
-            assert "ready" in db_check
-            
-            # If ready, status should be "connected"
-            if db_check["ready"]:
-                assert db_check["status"] == "connected"
-            # If not ready, should have error or not_initialized
-            else:
-                assert db_check["status"] in ["not_initialized", "error"]
-                if db_check["status"] == "error":
-                    assert "error" in db_check
+        status_code, data = probe_responses["/readiness"]
+
+        # Database should always be checked
+        assert "database" in data["checks"]
+        db_check = data["checks"]["database"]
+
+        # Should have status and ready fields
+        assert "status" in db_check
+        assert "ready" in db_check
+
+        # If ready, status should be "connected"
+        if db_check["ready"]:
+            assert db_check["status"] == "connected"
+        # If not ready, should have error or not_initialized
+        else:
+            assert db_check["status"] in ["not_initialized", "error"]
+            if db_check["status"] == "error":
+                assert "error" in db_check
     
-    @pytest.mark.asyncio
-    async def test_readiness_optional_services(self, base_url: str):
+    async def test_readiness_optional_services(self, probe_responses: Dict[str, JsonResult]):
         """Test readiness check handles optional services correctly"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{base_url}/readiness")
-            data = response.json()
-            
-            # Redis is optional - should not fail overall readiness
-            if "redis" in data["checks"]:
-                redis_check = data["checks"]["redis"]
-                if not redis_check["ready"]:
-                    # Should be marked as optional
-                    assert redis_check.get("optional", False)
-                    # Overall readiness should still be true if database is ready
-                    if data["checks"]["database"]["ready"]:
-                        # Redis failure shouldn't fail overall readiness
-                        pass  # This is expected
-    
-    @pytest.mark.asyncio
-    async def test_kubernetes_probe_compatibility(self, base_url: str):
+        status_code, data = probe_responses["/readiness"]
+
+        # Redis is optional - should not fail overall readiness
+        if "redis" in data["checks"]:
+            redis_check = data["checks"]["redis"]
+            if not redis_check["ready"]:
+                # Should be marked as optional
+                assert redis_check.get("optional", False)
+                # Overall readiness should still be true if database is ready
+                if data["checks"]["database"]["ready"]:
+                    # Redis failure shouldn't fail overall readiness
+                    pass  # This is expected
+    
+    async def test_kubernetes_probe_compatibility(self, client: httpx.AsyncClient):
         """Test probes are compatible with Kubernetes expectations"""
-        async with httpx.AsyncClient() as client:
-            # Liveness should always respond quickly
-            liveness_response = await client.get(
-                f"{base_url}/liveness",
-                timeout=5.0
-            )
-            assert liveness_response.status_code in [200, 500]
-            
-            # Readiness can return 503 when not ready
-            readiness_response = await client.get(
-                f"{base_url}/readiness",
-                timeout=5.0
-            )
-            assert readiness_response.status_code in [200, 503]
-    
-    @pytest.mark.asyncio
-    async def test_probe_response_time(self, base_url: str):
+        # Liveness should always respond quickly
+        liveness_response = await client.get(
+            "/liveness",
+            timeout=5.0
+        )
+        assert liveness_response.status_code in [200, 500]
+
+        # Readiness can return 503 when not ready
+        readiness_response = await client.get(
+            "/readiness",
+            timeout=5.0
+        )
+        assert readiness_response.status_code in [200, 503]
+    
+    async def test_probe_response_time(self, client: httpx.AsyncClient):
         """Test probes respond within acceptable time"""
-        async with httpx.AsyncClient() as client:
-            import time
-            
-            # Liveness should be very fast (<100ms)
-            start = time.time()
-            await client.get(f"{base_url}/liveness")
-            liveness_time = time.time() - start
-            assert liveness_time < 0.1, f"Liveness too slow: {liveness_time}s"
-            
-            # Readiness can be slower but should be <1s
-            start = time.time()
-            await client.get(f"{base_url}/readiness")
-            readiness_time = time.time() - start
-            assert readiness_time < 1.0, f"Readiness too slow: {readiness_time}s"
+        async def p95_latency(path: str) -> float:
+            samples = []
+            for _ in range(20):
+                start = time.perf_counter()
+                await client.get(path)
+                samples.append(time.perf_counter() - start)
+            return statistics.quantiles(samples, n=20)[18]
+
+        # Connections are already warm from the readiness gate
+        # Liveness should be very fast (<100ms)
+        liveness_time = await p95_latency("/liveness")
+        assert liveness_time < 0.1, f"Liveness P95 too slow: {liveness_time}s"
+
+        # Readiness can be slower but should be <1s
+        readiness_time = await p95_latency("/readiness")
+        assert readiness_time < 1.0, f"Readiness P95 too slow: {readiness_time}s"
 
 
 # Run tests